@@ -1,10 +1,18 @@
-class BadHTTPStatusError(Exception):
+class BotError(Exception):
+    """Базовое исключение бота с ключом сообщения из EXCEPTION_MESSAGES"""
+
+    def __init__(self, message: str = '', message_key: str = '') -> None:
+        super().__init__(message)
+        self.message_key = message_key
+
+
+class BadHTTPStatusError(BotError):
     """При обработке статус-кода запроса возникла ошибка"""
 
 
-class BadRequestError(Exception):
+class BadRequestError(BotError):
     """При обработке вашего запроса произошло неоднозначное исключение."""
 
 
-class HomeworkError(Exception):
+class HomeworkError(BotError):
     """При обработке параметров домашнего задания возникло неоднозначное исключение"""
@@ -1,12 +1,15 @@
 import logging
 import os
+import random
+import signal
 import sys
 import time
 import requests
 import telegram
 
 from http import HTTPStatus
-from typing import Dict
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Set, Tuple
 from dotenv import load_dotenv
 
 from exceptions import BadHTTPStatusError, BadRequestError, HomeworkError
@@ -18,19 +21,31 @@ TELEGRAM_TOKEN: str = os.getenv('TELEGRAM_TOKEN')
 TELEGRAM_CHAT_ID: str = os.getenv('CHAT_ID')
 
 RETRY_PERIOD: int = 600
+MAX_RETRY_PERIOD: int = 3600
+RETRY_JITTER: int = 30
+CONNECT_TIMEOUT: int = 5
+REQUEST_TIMEOUT: int = 30
 ENDPOINT: str = 'https://practicum.yandex.ru/api/user_api/homework_statuses/'
 HEADERS: Dict[str, str] = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
 
+_last_etag: Optional[Tuple[int, str]] = None
+_received_etag: Optional[Tuple[int, str]] = None
+
 HOMEWORK_VERDICTS: Dict[str, str] = {
     'approved': 'Работа проверена: ревьюеру всё понравилось. Ура!',
     'reviewing': 'Работа взята на проверку ревьюером.',
     'rejected': 'Работа проверена: у ревьюера есть замечания.'
 }
+_VERDICT_TEMPLATES: Dict[str, str] = {
+    status: 'Изменился статус проверки работы "{}". ' + verdict
+    for status, verdict in HOMEWORK_VERDICTS.items()
+}
 
-EXCEPTION_MESSAGES: Dict[str, str] = {
-    'token_not_found': 'Отсутствует обязательная переменная окружения: "{}"',
+EXCEPTION_MESSAGES: Mapping[str, str] = MappingProxyType({
+    'token_not_found': 'Отсутствует обязательная переменная окружения: "%s"',
     'endpoint_denied': ('Сбой в работе программы: '
                         f'Эндпоинт [{ENDPOINT}]{ENDPOINT} недоступен'),
+    'bad_json': 'Ответ API не является корректным JSON',
     'bad_response_format': ('Неверный формат данных "response", '
                             'ожидался словарь'),
     'bad_homework_format': 'Неверный формат данных "homework"',
@@ -45,7 +60,8 @@ EXCEPTION_MESSAGES: Dict[str, str] = {
                      'Parameters: {}; '
                      'Message: {}; '
                      'Response: {}')
-}
+})
+_BASE_FMT = EXCEPTION_MESSAGES['base_message'].format
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -62,80 +78,122 @@ def check_tokens() -> bool:
     К списку относится PRACTICUM_TOKEN, TELEGRAM_TOKEN, TELEGRAM_CHAT_ID.
     В случае их отсутствия программа возвращает False, иначе True.
     """
-    logging.debug('Проверка наличия требуемых токенов...')
-
-    for param in (PRACTICUM_TOKEN, TELEGRAM_TOKEN, TELEGRAM_CHAT_ID):
-        if not param:
-            logging.critical(
-                EXCEPTION_MESSAGES['token_not_found'].format(param)
-            )
-    return all((PRACTICUM_TOKEN, TELEGRAM_TOKEN, TELEGRAM_CHAT_ID))
+    logger.debug('Проверка наличия требуемых токенов...')
 
+    tokens: Dict[str, str] = {
+        'PRACTICUM_TOKEN': PRACTICUM_TOKEN,
+        'TELEGRAM_TOKEN': TELEGRAM_TOKEN,
+        'CHAT_ID': TELEGRAM_CHAT_ID
+    }
+    missing = [name for name, value in tokens.items() if not value]
+    for name in missing:
+        logger.critical(EXCEPTION_MESSAGES['token_not_found'], name)
+    return not missing
 
-def send_message(bot: telegram.Bot, message: str) -> None:
-    """Данная функция выполняет отправку сообщений пользователю."""
-    exception_message: str = ('Бот не отправил сообщение: '
-                              f'{EXCEPTION_MESSAGES["endpoint_denied"]}')
-    default_chat_message: str = ('Бот успешно отправил '
-                                 f'сообщение {message} пользователю с '
-                                 f'ID: {TELEGRAM_CHAT_ID}')
 
+def send_message(bot: telegram.Bot, message: str) -> bool:
+    """
+    Данная функция выполняет отправку сообщений пользователю.
+    Возвращает True, если сообщение было доставлено.
+    """
     try:
         bot.send_message(chat_id=TELEGRAM_CHAT_ID,
-                         text=message)
+                         text=message,
+                         timeout=REQUEST_TIMEOUT)
     except telegram.TelegramError:
-        logger.error(exception_message)
-    else:
-        logger.debug(default_chat_message)
+        logger.error('Бот не отправил сообщение: %s',
+                     EXCEPTION_MESSAGES['endpoint_denied'])
+        return False
+    logger.debug('Бот успешно отправил сообщение %s пользователю с ID: %s',
+                 message, TELEGRAM_CHAT_ID)
+    return True
+
+
+def get_api_answer(timestamp) -> Optional[dict]:
+    """
+    Данная функция выполняет проверку статус-кода запроса к ENDPOINT.
+    Запрос выполняется условно по ETag предыдущего ответа с тем же
+    from_date: если данные не изменились (HTTP 304), функция возвращает
+    None. ETag полученного ответа запоминается только после вызова
+    update_etag.
+    """
+    global _received_etag
 
+    _received_etag = None
 
-def get_api_answer(timestamp) -> dict:
-    """Данная функция выполняет проверку статус-кода запроса к ENDPOINT."""
+    headers: Dict[str, str] = dict(HEADERS)
+    if _last_etag and _last_etag[0] == timestamp:
+        headers['If-None-Match'] = _last_etag[1]
     params: Dict[str, str | dict] = {
         'url': ENDPOINT,
-        'headers': HEADERS,
-        'params': {'from_date': timestamp}
+        'params': {'from_date': timestamp},
+        'timeout': (CONNECT_TIMEOUT, REQUEST_TIMEOUT)
     }
     try:
-        response = requests.get(**params)
-        if response.status_code != HTTPStatus.OK:
-            raise BadHTTPStatusError(
-                EXCEPTION_MESSAGES['base_message'].format(
-                    response.status_code,
-                    params,
-                    EXCEPTION_MESSAGES['endpoint_denied'],
-                    response
-                )
-            )
+        response = requests.get(headers=headers, **params)
     except requests.RequestException as error:
-        message = EXCEPTION_MESSAGES['base_message'].format(
-            response.status_code,
-            params,
-            EXCEPTION_MESSAGES['endpoint_denied'],
-            response
+        message = _BASE_FMT(
+            None, params, EXCEPTION_MESSAGES['endpoint_denied'], None
+        )
+        raise BadRequestError(message + f' Error: {error}',
+                              message_key='endpoint_denied')
+    if response.status_code == HTTPStatus.NOT_MODIFIED:
+        _received_etag = _last_etag
+        return None
+    if response.status_code != HTTPStatus.OK:
+        raise BadHTTPStatusError(
+            _BASE_FMT(
+                response.status_code,
+                params,
+                EXCEPTION_MESSAGES['endpoint_denied'],
+                response
+            ),
+            message_key='endpoint_denied'
+        )
+    try:
+        answer = response.json()
+    except ValueError as error:
+        raise BadRequestError(
+            EXCEPTION_MESSAGES['bad_json'] + f' Error: {error}',
+            message_key='bad_json'
         )
-        raise BadRequestError(message + f"Error: {error}")
-    return response.json()
+    etag = response.headers.get('ETag')
+    _received_etag = (timestamp, etag) if etag else None
+    return answer
+
+
+def update_etag(handled: bool) -> None:
+    """
+    Данная функция запоминает ETag последнего ответа API.
+    Если ответ не прошёл проверку или сообщения по нему не доставлены,
+    ETag сбрасывается: иначе повторный запрос с тем же from_date
+    получит HTTP 304, и данные не будут обработаны снова.
+    """
+    global _last_etag, _received_etag
 
+    _last_etag = _received_etag if handled else None
+    _received_etag = None
 
-def check_response(response):
+
+def check_response(response) -> list:
     """
     Данная функция проверяет ответ (response) на требуемых тип данных.
     Далее проверяется наличие ключа "homeworks" и его тип данных
-    Функция возвращает первый элемент в списке "homeworks"
+    Функция возвращает весь список "homeworks"
     """
-    if not isinstance(response, dict):
+    try:
+        homeworks = response['homeworks']
+    except TypeError:
         message = (EXCEPTION_MESSAGES['bad_response_format']
                    + f'| Вернулся: {type(response)} ')
         raise TypeError(message)
+    except KeyError:
+        raise HomeworkError(EXCEPTION_MESSAGES['missing_homework'],
+                            message_key='missing_homework')
 
-    homeworks = response.get('homeworks')
-
-    if homeworks is None:
-        raise HomeworkError(EXCEPTION_MESSAGES['missing_homework'])
     if not isinstance(homeworks, list):
         raise TypeError(EXCEPTION_MESSAGES['bad_homework_format'])
-    return homeworks[0]
+    return homeworks
 
 
 def parse_status(homework) -> str:
@@ -145,52 +203,124 @@ def parse_status(homework) -> str:
     ДР - выбрасывается исключения. Функция возвращает
     строку с вердиктом по ДР.
     """
-    logger.debug(f'Обработка данных: {homework}')
+    logger.debug('Обработка данных: %s', homework)
 
     homework_name: str = homework.get('homework_name')
     current_status: str = homework.get('status')
 
     if not homework_name:
-        raise HomeworkError(EXCEPTION_MESSAGES['has_not_homework'])
+        raise HomeworkError(EXCEPTION_MESSAGES['has_not_homework'],
+                            message_key='has_not_homework')
+
+    template = _VERDICT_TEMPLATES.get(current_status)
+    if template is None:
+        raise HomeworkError(EXCEPTION_MESSAGES['bad_verdict_status'],
+                            message_key='bad_verdict_status')
+    return template.format(homework_name)
+
+
+def error_key(error: Exception) -> str:
+    """
+    Данная функция возвращает устойчивый ключ ошибки.
+    Ключ состоит из класса исключения и ключа сообщения из
+    EXCEPTION_MESSAGES: текст ошибки может меняться от запроса
+    к запросу (например, адрес объекта соединения).
+    """
+    return f'{type(error).__name__}:{getattr(error, "message_key", error)}'
+
+
+def collect_messages(homeworks: list) -> Dict[str, str]:
+    """
+    Данная функция формирует сообщения по списку домашних работ.
+    Каждая работа обрабатывается отдельно: ошибка в одной из них
+    не мешает отправить вердикты по остальным.
+    Возвращает словарь "ключ уведомления -> текст сообщения".
+    """
+    if not homeworks:
+        message = 'Статус домашней работы не изменился!'
+        logger.info(message)
+        return {message: message}
+    verdicts = {}
+    errors = {}
+    for homework in homeworks:
+        try:
+            message = parse_status(homework)
+        except HomeworkError as error:
+            logger.error(error)
+            errors[error_key(error)] = str(error)
+        else:
+            logger.info(message)
+            verdicts[message] = message
+    return {**verdicts, **errors}
 
-    if current_status not in HOMEWORK_VERDICTS:
-        raise HomeworkError(EXCEPTION_MESSAGES['bad_status'])
 
-    verdict = HOMEWORK_VERDICTS.get(current_status)
-    return f'Изменился статус проверки работы "{homework_name}". {verdict}'
+def deliver_messages(bot: telegram.Bot, messages: Dict[str, str],
+                     sent_keys: Set[str]) -> Set[str]:
+    """
+    Данная функция отправляет пользователю новые сообщения.
+    Сообщения с ключами из прошлого цикла опроса (sent_keys)
+    повторно не отправляются. Возвращает ключи доставленных сообщений.
+    """
+    delivered = set()
+    for key, message in messages.items():
+        if key in sent_keys or send_message(bot, message):
+            delivered.add(key)
+    return delivered
 
 
 def main() -> None:
     """Основная логика работы бота."""
     if not check_tokens():
         logger.critical('Программа принудительно остановлена')
-        exit('Программа остановлена: Отсутствуют требуемые токены')
+        sys.exit('Программа остановлена: Отсутствуют требуемые токены')
 
     bot = telegram.Bot(token=TELEGRAM_TOKEN)
     timestamp = int(time.time())
+    failures = 0
+    sent_keys: Set[str] = set()
 
     while True:
+        retry_period = RETRY_PERIOD
+        messages: Dict[str, str] = {}
+        next_timestamp = timestamp
+        handled = False
         try:
             request = get_api_answer(timestamp)
-            response = check_response(request)
-
-            if response:
-                message_by_status = parse_status(response)
-                send_message(bot, message_by_status)
-                logger.info(message_by_status)
-        except (BadRequestError,
-                BadHTTPStatusError,
-                HomeworkError,
-                TypeError) as error:
+            failures = 0
+            if request is None:
+                logger.debug('Данные API не изменились с прошлого запроса')
+            else:
+                homeworks = check_response(request)
+                messages = collect_messages(homeworks)
+                next_timestamp = request.get('current_date', timestamp)
+            handled = True
+        except (BadRequestError, BadHTTPStatusError) as error:
+            failures += 1
+            retry_period = (
+                min(RETRY_PERIOD * 2 ** failures, MAX_RETRY_PERIOD)
+                + random.uniform(0, RETRY_JITTER)
+            )
+            messages[error_key(error)] = str(error)
+            logger.error(error)
+        except (HomeworkError, TypeError) as error:
+            messages[error_key(error)] = str(error)
             logger.error(error)
-            send_message(bot, error)
-        except IndexError:
-            message = 'Статус домашней работы не изменился!'
-            send_message(bot, message)
-            logging.info(message)
-        finally:
-            time.sleep(RETRY_PERIOD)
+
+        if messages:
+            sent_keys = deliver_messages(bot, messages, sent_keys)
+        # Пока хотя бы одно сообщение не доставлено, from_date и ETag
+        # не сохраняются, чтобы следующий запрос вернул эти домашние
+        # работы снова.
+        delivered = sent_keys.issuperset(messages)
+        if delivered:
+            timestamp = next_timestamp
+        update_etag(handled and delivered)
+        time.sleep(retry_period)
 
 
 if __name__ == '__main__':
-    main()
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        main()
+    except KeyboardInterrupt:
+        logger.info('Бот остановлен')
@@ -230,6 +230,77 @@ class TestHomework:
             f'Проверьте, что функция `{func_name}` возвращает словарь.'
         )
 
+    def test_get_api_answer_not_modified(self, monkeypatch, random_timestamp,
+                                         current_timestamp, homework_module):
+        monkeypatch.setattr(homework_module, '_last_etag', None)
+        monkeypatch.setattr(homework_module, '_received_etag', None)
+        etag = '"abc123"'
+
+        def mock_response_get(*args, **kwargs):
+            if kwargs['headers'].get('If-None-Match') == etag:
+                return utils.MockResponseGET(
+                    *args, random_timestamp=random_timestamp,
+                    http_status=HTTPStatus.NOT_MODIFIED, **kwargs
+                )
+            response = utils.MockResponseGET(
+                *args, random_timestamp=random_timestamp, **kwargs
+            )
+            response.headers = {'ETag': etag}
+            return response
+
+        monkeypatch.setattr(requests, 'get', mock_response_get)
+
+        assert isinstance(
+            homework_module.get_api_answer(current_timestamp), dict
+        ), 'Убедитесь, что первый запрос к API возвращает словарь.'
+        homework_module.update_etag(False)
+        assert isinstance(
+            homework_module.get_api_answer(current_timestamp), dict
+        ), (
+            'Убедитесь, что ETag необработанного ответа не передаётся '
+            'в следующем запросе.'
+        )
+        homework_module.update_etag(True)
+        assert homework_module.get_api_answer(current_timestamp) is None, (
+            'Убедитесь, что при ответе API с кодом 304 функция '
+            '`get_api_answer` возвращает `None`.'
+        )
+        assert isinstance(
+            homework_module.get_api_answer(current_timestamp + 1), dict
+        ), (
+            'Убедитесь, что ETag передаётся только в запросе с тем же '
+            '`from_date`.'
+        )
+
+    def test_get_api_answer_with_invalid_json(self, monkeypatch,
+                                              random_timestamp,
+                                              current_timestamp,
+                                              homework_module):
+        class MockResponseWithInvalidJSON(utils.MockResponseGET):
+            def json(self):
+                raise ValueError('Expecting value')
+
+        def mock_response_get(*args, **kwargs):
+            return MockResponseWithInvalidJSON(
+                *args, random_timestamp=random_timestamp, **kwargs
+            )
+
+        monkeypatch.setattr(requests, 'get', mock_response_get)
+        try:
+            homework_module.get_api_answer(current_timestamp)
+        except ValueError as e:
+            raise AssertionError(
+                'Убедитесь, что функция `get_api_answer` обрабатывает '
+                'ответ API, который не является корректным JSON.'
+            ) from e
+        except Exception:
+            pass
+        else:
+            raise AssertionError(
+                'Убедитесь, что функция `get_api_answer` выбрасывает '
+                'исключение, если ответ API не является корректным JSON.'
+            )
+
     @pytest.mark.parametrize('response', NOT_OK_RESPONSES.values())
     def test_get_not_200_status_response(self,
                                          monkeypatch,
@@ -279,6 +350,25 @@ class TestHomework:
         except Exception:
             pass
 
+    def test_get_api_answer_request_exception_is_bad_request_error(
+            self, current_timestamp, monkeypatch, homework_module
+    ):
+        def mock_request_get_with_exception(*args, **kwargs):
+            raise requests.ConnectionError('Connection refused')
+
+        monkeypatch.setattr(requests, 'get', mock_request_get_with_exception)
+        with pytest.raises(homework_module.BadRequestError) as exc_info:
+            homework_module.get_api_answer(current_timestamp)
+        message = str(exc_info.value)
+        assert 'Connection refused' in message, (
+            'Убедитесь, что сообщение `BadRequestError` содержит текст '
+            'исходной ошибки запроса.'
+        )
+        assert 'OAuth' not in message, (
+            'Убедитесь, что токен авторизации не попадает в сообщение '
+            'об ошибке.'
+        )
+
     def test_parse_status_with_expected_statuses(self, homework_module):
         func_name = 'parse_status'
         utils.check_function(
@@ -354,6 +444,21 @@ class TestHomework:
                     'статус домашней работы либо домашку без статуса.'
                 )
 
+    def test_parse_status_unknown_status_raises_homework_error(
+            self, homework_module
+    ):
+        with pytest.raises(homework_module.HomeworkError) as exc_info:
+            homework_module.parse_status(
+                {'homework_name': 'hw123', 'status': 'unknown'}
+            )
+        assert str(exc_info.value) == (
+            homework_module.EXCEPTION_MESSAGES['bad_verdict_status']
+        ), (
+            'Убедитесь, что при недокументированном статусе функция '
+            '`parse_status` выбрасывает `HomeworkError` с сообщением '
+            '`bad_verdict_status`.'
+        )
+
     def test_parse_status_no_homework_name_key(self, homework_module):
         homework_with_invalid_name = {
             'status': 'approved'
@@ -408,6 +513,20 @@ class TestHomework:
                 f'`{func_name}` не вызывает исключений.'
             ) from e
 
+    def test_check_response_returns_all_homeworks(self, random_timestamp,
+                                                  homework_module):
+        homeworks = [
+            {'homework_name': 'hw123', 'status': 'approved'},
+            {'homework_name': 'hw456', 'status': 'reviewing'}
+        ]
+        result = homework_module.check_response(
+            {'homeworks': homeworks, 'current_date': random_timestamp}
+        )
+        assert result == homeworks, (
+            'Убедитесь, что функция `check_response` возвращает '
+            'весь список `homeworks`.'
+        )
+
     @pytest.mark.parametrize('response', INVALID_RESPONSES.values())
     def test_check_invalid_response(self, response, homework_module):
         func_name = 'check_response'
@@ -590,6 +709,240 @@ class TestHomework:
         if platform.system() != 'Windows':
             homework_module.main = utils.with_timeout(homework_module.main)
 
+    def run_main(self, monkeypatch, homework_module, answers,
+                 send_results=(), expected=utils.BreakInfiniteLoop,
+                 etag=False):
+        """
+        Run main() for one poll per item in `answers` and record the
+        `from_date` of every request, every sleep and every sent message.
+
+        An item of `answers` is a response payload, an HTTP status or
+        an exception raised by `requests.get`. `send_results` tells for
+        each send in turn whether Telegram accepts it; the rest succeed.
+        With `etag` every answer carries an ETag built from `from_date`,
+        and a request with a matching `If-None-Match` gets HTTP 304.
+        """
+        monkeypatch.setattr(homework_module, 'PRACTICUM_TOKEN', 'sometoken')
+        monkeypatch.setattr(homework_module, 'TELEGRAM_TOKEN', '1234:abcdefg')
+        monkeypatch.setattr(homework_module, 'TELEGRAM_CHAT_ID', '12345')
+        monkeypatch.setattr(homework_module, '_last_etag', None)
+        monkeypatch.setattr(homework_module, '_received_etag', None)
+        calls = {'from_date': [], 'sleep': [], 'sent': [],
+                 'if_none_match': []}
+        polls = len(answers)
+        answers = iter(answers)
+        send_results = list(send_results)
+
+        def mock_response_get(*args, **kwargs):
+            from_date = kwargs['params']['from_date']
+            if_none_match = kwargs['headers'].get('If-None-Match')
+            calls['from_date'].append(from_date)
+            calls['if_none_match'].append(if_none_match)
+            answer = next(answers)
+            if isinstance(answer, BaseException):
+                raise answer
+            if etag and if_none_match == f'"{from_date}"':
+                answer = HTTPStatus.NOT_MODIFIED
+            if isinstance(answer, HTTPStatus):
+                return utils.MockResponseGET(http_status=answer, data={})
+            response = utils.MockResponseGET(data=answer)
+            if etag:
+                response.headers = {'ETag': f'"{from_date}"'}
+            return response
+
+        def mock_sleep(secs):
+            calls['sleep'].append(secs)
+            if len(calls['sleep']) == polls:
+                raise utils.BreakInfiniteLoop('break')
+
+        class RecordingBot(utils.MockTelegramBot):
+            def send_message(self, chat_id=None, text=None, **kwargs):
+                if send_results and not send_results.pop(0):
+                    raise telegram.error.TelegramError('Something wrong')
+                calls['sent'].append(text)
+
+        monkeypatch.setattr(requests, 'get', mock_response_get)
+        monkeypatch.setattr(time, 'sleep', mock_sleep)
+        monkeypatch.setattr(telegram, 'Bot', RecordingBot)
+        with pytest.raises(expected):
+            homework_module.main()
+        return calls
+
+    def test_main_stops_at_once_on_interrupt(self, monkeypatch,
+                                             homework_module):
+        calls = self.run_main(
+            monkeypatch, homework_module, [KeyboardInterrupt()],
+            expected=KeyboardInterrupt
+        )
+        assert calls['sleep'] == [] and calls['sent'] == [], (
+            'Убедитесь, что при прерывании (SIGINT/SIGTERM) бот '
+            'останавливается сразу, не отправляя сообщения и не '
+            'вызывая `time.sleep()`.'
+        )
+
+    def test_main_sends_repeated_status_once(self, monkeypatch,
+                                             homework_module):
+        approved = {'homeworks': [{'homework_name': 'hw1',
+                                   'status': 'approved'}],
+                    'current_date': 100}
+        rejected = {'homeworks': [{'homework_name': 'hw1',
+                                   'status': 'rejected'}],
+                    'current_date': 200}
+        calls = self.run_main(
+            monkeypatch, homework_module, [approved, approved, rejected]
+        )
+        assert calls['sent'] == [
+            homework_module.parse_status(approved['homeworks'][0]),
+            homework_module.parse_status(rejected['homeworks'][0])
+        ], (
+            'Убедитесь, что повторный статус не отправляется в Telegram, '
+            'а изменившийся отправляется.'
+        )
+
+    def test_main_sends_repeated_error_once(self, monkeypatch,
+                                            homework_module):
+        # Each error text holds a different object address, as the
+        # errors raised by urllib3 for a refused connection do.
+        calls = self.run_main(monkeypatch, homework_module, [
+            requests.ConnectionError(object()),
+            requests.ConnectionError(object()),
+            HTTPStatus.INTERNAL_SERVER_ERROR,
+            requests.ConnectionError(object())
+        ])
+        assert len(calls['sent']) == 3, (
+            'Убедитесь, что одна и та же ошибка отправляется в Telegram '
+            'один раз, а новая ошибка отправляется снова.'
+        )
+        assert 'HTTP Status: 500' in calls['sent'][1]
+
+    def test_main_advances_from_date_after_delivery(self, monkeypatch,
+                                                    homework_module):
+        approved = {'homeworks': [{'homework_name': 'hw1',
+                                   'status': 'approved'}],
+                    'current_date': 100}
+        empty = {'homeworks': [], 'current_date': 200}
+        start = int(time.time())
+        calls = self.run_main(
+            monkeypatch, homework_module,
+            [approved, approved, empty, empty],
+            send_results=[False]
+        )
+        assert calls['from_date'][0] >= start
+        assert calls['from_date'][1:] == [calls['from_date'][0], 100, 200], (
+            'Убедитесь, что `from_date` сдвигается на `current_date` из '
+            'ответа API только после доставки всех сообщений.'
+        )
+        assert calls['sent'] == [
+            homework_module.parse_status(approved['homeworks'][0]),
+            'Статус домашней работы не изменился!'
+        ], (
+            'Убедитесь, что вердикт, который не удалось отправить, '
+            'отправляется при следующем опросе.'
+        )
+
+    def test_main_refetches_undelivered_poll_despite_etag(self, monkeypatch,
+                                                          homework_module):
+        approved = {'homeworks': [{'homework_name': 'hw1',
+                                   'status': 'approved'}],
+                    'current_date': 100}
+        calls = self.run_main(
+            monkeypatch, homework_module, [approved, approved, approved],
+            send_results=[False], etag=True
+        )
+        start = calls['from_date'][0]
+        assert calls['from_date'] == [start, start, 100]
+        assert calls['if_none_match'][:2] == [None, None], (
+            'Убедитесь, что после неудачной отправки повторный запрос '
+            'к API выполняется без `If-None-Match`.'
+        )
+        assert calls['sent'][:1] == [
+            homework_module.parse_status(approved['homeworks'][0])
+        ], (
+            'Убедитесь, что вердикт, который не удалось отправить, '
+            'отправляется при следующем опросе, даже если API '
+            'поддерживает ETag.'
+        )
+
+    def test_main_drops_etag_of_invalid_response(self, monkeypatch,
+                                                 homework_module):
+        invalid = {'current_date': 100}
+        calls = self.run_main(
+            monkeypatch, homework_module, [invalid, invalid], etag=True
+        )
+        assert calls['if_none_match'] == [None, None], (
+            'Убедитесь, что ETag ответа, не прошедшего проверку, '
+            'не передаётся в следующем запросе.'
+        )
+
+    def test_main_sends_every_homework_despite_invalid_one(self, monkeypatch,
+                                                           homework_module):
+        homeworks = [
+            {'homework_name': 'hw0', 'status': 'weird'},
+            {'homework_name': 'hw1', 'status': 'approved'},
+            {'homework_name': 'hw2', 'status': 'rejected'}
+        ]
+        calls = self.run_main(
+            monkeypatch, homework_module,
+            [{'homeworks': homeworks, 'current_date': 100},
+             {'homeworks': [], 'current_date': 200}]
+        )
+        assert calls['sent'][:3] == [
+            homework_module.parse_status(homeworks[1]),
+            homework_module.parse_status(homeworks[2]),
+            homework_module.EXCEPTION_MESSAGES['bad_verdict_status']
+        ], (
+            'Убедитесь, что бот отправляет вердикты по всем домашним '
+            'работам из ответа API, даже если одна из них некорректна.'
+        )
+        assert calls['from_date'][1] == 100, (
+            'Убедитесь, что после доставки всех сообщений `from_date` '
+            'сдвигается на `current_date` из ответа API.'
+        )
+
+    def test_main_backs_off_on_api_failures(self, monkeypatch,
+                                            homework_module):
+        failure = HTTPStatus.INTERNAL_SERVER_ERROR
+        calls = self.run_main(
+            monkeypatch, homework_module,
+            [failure] * 4 + [{'homeworks': [], 'current_date': 100}]
+        )
+        jitter = homework_module.RETRY_JITTER
+        max_period = homework_module.MAX_RETRY_PERIOD
+        first, second, *capped, success = calls['sleep']
+        assert 1200 <= first <= 1200 + jitter, (
+            'Убедитесь, что после первой ошибки API пауза удваивается.'
+        )
+        assert 2400 <= second <= 2400 + jitter, (
+            'Убедитесь, что после второй ошибки API подряд пауза '
+            'удваивается снова.'
+        )
+        for period in capped:
+            assert max_period <= period <= max_period + jitter, (
+                'Убедитесь, что пауза не превышает `MAX_RETRY_PERIOD` '
+                'с учётом `RETRY_JITTER`.'
+            )
+        assert success == self.RETRY_PERIOD, (
+            'Убедитесь, что после успешного ответа API пауза '
+            'возвращается к `RETRY_PERIOD`.'
+        )
+
+    def test_check_tokens_logs_env_var_name(self, caplog, monkeypatch,
+                                            homework_module):
+        monkeypatch.setattr(homework_module, 'PRACTICUM_TOKEN', 'sometoken')
+        monkeypatch.setattr(homework_module, 'TELEGRAM_TOKEN', '1234:abcdefg')
+        monkeypatch.setattr(homework_module, 'TELEGRAM_CHAT_ID', None)
+        with caplog.at_level(logging.CRITICAL):
+            assert not homework_module.check_tokens()
+        messages = [record.message for record in caplog.records
+                    if record.levelno == logging.CRITICAL]
+        assert messages == [
+            homework_module.EXCEPTION_MESSAGES['token_not_found']
+            % 'CHAT_ID'
+        ], (
+            'Убедитесь, что в логе указано имя отсутствующей '
+            'переменной окружения `CHAT_ID`.'
+        )
+
     def test_main_without_env_vars_raise_exception(
             self, caplog, monkeypatch, random_timestamp, current_timestamp,
             random_message, homework_module